@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the album edit actions, so the workflow pays for one
+Python startup and one set of imports whichever action it runs.
+
+Usage:
+  album_action.py <operation> <args...>
+
+Operations:
+  - delete <album_json>
+  - rename <new_title>              (album JSON from environment variable 'albumToEdit')
+  - date <album_json> <date_input>
+  - count <item_count>              (album JSON from environment variable 'albumToEdit')
+"""
+
+import sys
+
+import delete_album
+import edit_album_title
+import edit_date
+import edit_item_count
+from shared_db import fail
+
+OPERATIONS = {
+    "delete": delete_album.main,
+    "rename": edit_album_title.main,
+    "date": edit_date.main,
+    "count": edit_item_count.main,
+}
+
+def main():
+    operation = sys.argv[1] if len(sys.argv) > 1 else ""
+    handler = OPERATIONS.get(operation)
+    
+    if handler is None:
+        fail("Error: Unknown album action", "Usage: album_action.py <delete|rename|date|count> <args...>")
+    
+    handler(sys.argv[2:])
+
+if __name__ == "__main__":
+    main()
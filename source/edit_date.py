@@ -18,64 +18,41 @@ The script will update:
 
 import json
 import sys
-import os
-from pathlib import Path
-from datetime import datetime
 
-def get_database_path():
-    """Get the path to the photoAlbums.json database."""
-    data_folder = os.getenv('alfred_workflow_data')
-    if not data_folder:
-        # Fallback to script directory if env var not set
-        data_folder = Path(__file__).parent
-    else:
-        data_folder = Path(data_folder)
-    
-    # Create data folder if it doesn't exist
-    if not os.path.exists(data_folder):
-        os.makedirs(data_folder)
-    
-    return data_folder / "photoAlbums.json"
+from shared_db import emit, fail, find_record, patch_record
 
-def read_database():
-    """Read all albums from the database."""
-    db_path = get_database_path()
-    albums = []
+# Month abbreviations and lengths, used to parse and format dates without strptime
+MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def split_date(date_string):
+    """
+    Split a yyyy-mm-dd string into (year, month, day) integers.
+    Returns None if the string is not a valid date in that format.
+    """
+    if len(date_string) != 10 or date_string[4] != '-' or date_string[7] != '-':
+        return None
     
-    if not db_path.exists():
-        return albums
+    year, month, day = date_string[:4], date_string[5:7], date_string[8:]
+    if not (year.isdigit() and month.isdigit() and day.isdigit() and date_string.isascii()):
+        return None
     
-    try:
-        with open(db_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    albums.append(json.loads(line))
-    except Exception as e:
-        return []
+    year, month, day = int(year), int(month), int(day)
+    if year < 1 or not 1 <= month <= 12:
+        return None
     
-    return albums
-
-def write_database(albums):
-    """Write all albums to the database."""
-    db_path = get_database_path()
+    days = DAYS_IN_MONTH[month - 1]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        days = 29
+    if not 1 <= day <= days:
+        return None
     
-    try:
-        with open(db_path, 'w', encoding='utf-8') as f:
-            for album in albums:
-                f.write(json.dumps(album, ensure_ascii=False) + '\n')
-        return True
-    except Exception as e:
-        print(f"Error writing database: {e}", file=sys.stderr)
-        return False
+    return year, month, day
 
 def validate_date(date_string):
     """Validate that a date string is in yyyy-mm-dd format."""
-    try:
-        datetime.strptime(date_string, "%Y-%m-%d")
-        return True
-    except ValueError:
-        return False
+    return split_date(date_string) is not None
 
 def parse_date_input(date_input):
     """
@@ -118,11 +95,12 @@ def format_date_for_display(date_string):
     """
     Convert yyyy-mm-dd to display format like "Oct 30, 2024".
     """
-    try:
-        dt = datetime.strptime(date_string, "%Y-%m-%d")
-        return dt.strftime("%b %d, %Y")
-    except:
+    parts = split_date(date_string)
+    if not parts:
         return date_string
+    
+    year, month, day = parts
+    return f"{MONTH_NAMES[month - 1]} {day:02d}, {year}"
 
 def format_range_for_display(start_date, end_date):
     """
@@ -130,120 +108,68 @@ def format_range_for_display(start_date, end_date):
     Same year: "Oct 30 – Nov 2"
     Different years: "Oct 30, 2023 – Nov 2, 2024"
     """
-    try:
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        if start_dt.year == end_dt.year:
-            # Same year: show year only on end date
-            start_formatted = start_dt.strftime("%b %d")
-            end_formatted = end_dt.strftime("%b %d")
-            return f"{start_formatted} – {end_formatted}"
-        else:
-            # Different years: show year on both
-            start_formatted = start_dt.strftime("%b %d, %Y")
-            end_formatted = end_dt.strftime("%b %d, %Y")
-            return f"{start_formatted} – {end_formatted}"
-    except:
+    start_parts = split_date(start_date)
+    end_parts = split_date(end_date)
+    if not start_parts or not end_parts:
         return f"{start_date} – {end_date}"
+    
+    start_year, start_month, start_day = start_parts
+    end_year, end_month, end_day = end_parts
+    start_formatted = f"{MONTH_NAMES[start_month - 1]} {start_day:02d}"
+    end_formatted = f"{MONTH_NAMES[end_month - 1]} {end_day:02d}"
+    
+    if start_year != end_year:
+        # Different years: show year on both
+        start_formatted = f"{start_formatted}, {start_year}"
+        end_formatted = f"{end_formatted}, {end_year}"
+    
+    return f"{start_formatted} – {end_formatted}"
 
-def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({
-            "alfredworkflow": {
-                "variables": {
-                    "notification_title": "Error: Missing arguments",
-                    "notification_subtitle": "Usage: edit_date.py <album_json> <date_input>"
-                }
-            }
-        }))
-        sys.exit(1)
+def main(args):
+    if len(args) < 2:
+        fail("Error: Missing arguments", "Usage: edit_date.py <album_json> <date_input>")
     
     # Parse arguments
     try:
-        album_data = json.loads(sys.argv[1])
-        date_input = sys.argv[2]
+        album_data = json.loads(args[0])
+        date_input = args[1]
     except json.JSONDecodeError:
-        print(json.dumps({
-            "alfredworkflow": {
-                "variables": {
-                    "notification_title": "Error: Invalid album data",
-                    "notification_subtitle": "Could not parse album JSON"
-                }
-            }
-        }))
-        sys.exit(1)
+        fail("Error: Invalid album data", "Could not parse album JSON")
     
     # Parse date input
     parsed_date = parse_date_input(date_input)
     if not parsed_date:
-        print(json.dumps({
-            "alfredworkflow": {
-                "variables": {
-                    "notification_title": "Error: Invalid date format",
-                    "notification_subtitle": "Use yyyy-mm-dd or yyyy-mm-dd--yyyy-mm-dd"
-                }
-            }
-        }))
-        sys.exit(1)
+        fail("Error: Invalid date format", "Use yyyy-mm-dd or yyyy-mm-dd--yyyy-mm-dd")
     
     start_date, end_date, date_range = parsed_date
     
     # Get album URL
     album_url = album_data.get("url", "")
     if not album_url:
-        print(json.dumps({
-            "alfredworkflow": {
-                "variables": {
-                    "notification_title": "Error: Album URL not found",
-                    "notification_subtitle": "Cannot identify album to edit"
-                }
-            }
-        }))
-        sys.exit(1)
+        fail("Error: Album URL not found", "Cannot identify album to edit")
     
-    # Read database
-    albums = read_database()
+    # Find the album
+    try:
+        record, wasted_bytes = find_record(album_url)
+    except Exception as e:
+        fail("Error reading database", str(e))
     
-    # Find and update the album
-    album_found = False
-    for album in albums:
-        if album.get("url") == album_url:
-            album_found = True
-            
-            # Update date fields
-            album["dateRange"] = date_range
-            album["startDate"] = start_date
-            if end_date:
-                album["endDate"] = end_date
-            elif "endDate" in album:
-                # Remove endDate if switching from range to single date
-                del album["endDate"]
-            
-            break
+    if record is None:
+        fail("Error: Album not found", "Album not in database")
     
-    if not album_found:
-        print(json.dumps({
-            "alfredworkflow": {
-                "variables": {
-                    "notification_title": "Error: Album not found",
-                    "notification_subtitle": "Album not in database"
-                }
-            }
-        }))
-        sys.exit(1)
+    # Update date fields
+    album, offset, length = record
+    album["dateRange"] = date_range
+    album["startDate"] = start_date
+    if end_date:
+        album["endDate"] = end_date
+    elif "endDate" in album:
+        # Remove endDate if switching from range to single date
+        del album["endDate"]
     
-    # Write updated database
-    if not write_database(albums):
-        print(json.dumps({
-            "alfredworkflow": {
-                "variables": {
-                    "notification_title": "Error: Failed to save",
-                    "notification_subtitle": "Could not write to database"
-                }
-            }
-        }))
-        sys.exit(1)
+    # Patch the album's line in place, compacting the database if it has grown too sparse
+    if not patch_record(offset, length, album, wasted_bytes):
+        fail("Error: Failed to save", "Could not write to database")
     
     # Create success message with formatted dates
     if end_date:
@@ -254,15 +180,8 @@ def main():
         message = f"Date updated to: {display_date}"
     
     # Output as environment variables for notification
-    print(json.dumps({
-        "alfredworkflow": {
-            "variables": {
-                "notification_title": "✓ Date updated successfully",
-                "notification_subtitle": message
-            }
-        }
-    }))
+    emit("✓ Date updated successfully", message)
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
 
@@ -14,12 +14,13 @@ Shows:
 - Albums missing both
 
 Each category can be clicked to view those specific albums in search_albums.py.
+The category's album ids are written to a file in the data folder and passed
+on as its path in the ID_list_path variable.
 """
 
-import json
-import sys
-import os
-from pathlib import Path
+from itertools import compress
+
+from shared_db import ALL_ALBUMS, ICON, load_albums, write_alfred_response, write_id_list
 
 def format_number(num):
     """Format a number with thousand separators."""
@@ -30,112 +31,92 @@ def format_number(num):
     except (ValueError, TypeError):
         return str(num)
 
-def get_database_path():
-    """Get the path to the photoAlbums.json database."""
-    data_folder = os.getenv('alfred_workflow_data')
-    if not data_folder:
-        # Fallback to script directory if env var not set
-        data_folder = Path(__file__).parent
+# Category masks hold one byte per album, 1 if the album belongs to the category
+NOT_TABLE = bytes([1, 0]) + bytes(254)
+
+def mask_not(mask):
+    """Invert a category mask."""
+    return mask.translate(NOT_TABLE)
+
+def mask_or(a, b):
+    """Combine two category masks with OR, a whole mask at a time."""
+    return (int.from_bytes(a, "big") | int.from_bytes(b, "big")).to_bytes(len(a), "big")
+
+def mask_and(a, b):
+    """Combine two category masks with AND, a whole mask at a time."""
+    return (int.from_bytes(a, "big") & int.from_bytes(b, "big")).to_bytes(len(a), "big")
+
+def category_item(label, count, subtitle, id_list_path=None):
+    """
+    Create a clickable Alfred item for an album category, opened in search_albums.py.
+    Without an id_list_path the item stands for all albums.
+    Both ID variables are always set, the unused one to "", so a value left over
+    from a previously opened category never overrides this one.
+    """
+    if id_list_path:
+        variables = {"ID_list": "", "ID_list_path": id_list_path, "mySource": "album_stats"}
     else:
-        data_folder = Path(data_folder)
-    
-    # Create data folder if it doesn't exist
-    if not os.path.exists(data_folder):
-        os.makedirs(data_folder)
-    
-    return data_folder / "photoAlbums.json"
-
-def read_database():
-    """Read all albums from the database."""
-    db_path = get_database_path()
-    albums = []
-    
-    if not db_path.exists():
-        return albums
+        variables = {"ID_list": ALL_ALBUMS, "ID_list_path": "", "mySource": "album_stats"}
     
-    try:
-        with open(db_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    albums.append(json.loads(line))
-    except Exception as e:
-        return []
-    
-    return albums
-
-def is_missing_item_count(album):
-    """Check if album is missing item count."""
-    item_count = album.get("itemCount")
-    return item_count is None or item_count == 0
-
-def is_missing_date(album):
-    """Check if album is missing date information."""
-    start_date = album.get("startDate", "")
-    date_range = album.get("dateRange", "")
-    return not start_date and not date_range
-
-def alfred_response(items):
-    """Create an Alfred JSON response with items."""
-    return json.dumps({"items": items}, ensure_ascii=False)
-
-def plural(count, singular, plural_form):
-    """Format a number with thousand separators and pluralize."""
-    return f"{format_number(count)} {singular if count == 1 else plural_form}"
+    return {
+        "title": f"{label}: {count:,} {'album' if count == 1 else 'albums'}",
+        "subtitle": subtitle,
+        "arg": "",
+        "valid": True,
+        "variables": variables,
+        "icon": ICON
+    }
 
 def main():
     # Read database
-    albums = read_database()
+    albums = load_albums()
     
     if not albums:
-        print(alfred_response([{
+        write_alfred_response([{
             "title": "No albums in database",
             "subtitle": "The database is empty. Add some albums first!",
             "valid": False
-        }]))
+        }])
         return
     
-    # Calculate all statistics
+    # Project the fields the statistics need into columns in a single pass
     all_ids = []
-    complete_ids = []
-    incomplete_ids = []
-    missing_count_ids = []
-    missing_date_ids = []
-    missing_both_ids = []
-    with_tags_ids = []
-    without_tags_ids = []
+    missing_count = bytearray()
+    missing_date = bytearray()
+    has_tags = bytearray()
+    
+    # Bound methods are looked up once, and the completeness checks are inlined
+    add_id = all_ids.append
+    add_missing_count = missing_count.append
+    add_missing_date = missing_date.append
+    add_has_tags = has_tags.append
     
     for album in albums:
-        album_id = album.get("id", "")
+        get = album.get
+        album_id = get("id")
         if not album_id:
             continue
         
-        all_ids.append(album_id)
-        
-        # Check completeness
-        missing_count = is_missing_item_count(album)
-        missing_date = is_missing_date(album)
-        
-        if missing_count and missing_date:
-            missing_both_ids.append(album_id)
-            missing_count_ids.append(album_id)
-            missing_date_ids.append(album_id)
-            incomplete_ids.append(album_id)
-        elif missing_count:
-            missing_count_ids.append(album_id)
-            incomplete_ids.append(album_id)
-        elif missing_date:
-            missing_date_ids.append(album_id)
-            incomplete_ids.append(album_id)
-        else:
-            complete_ids.append(album_id)
-        
-        # Check tags
-        tags = album.get("tags", [])
-        if tags and len(tags) > 0:
-            with_tags_ids.append(album_id)
-        else:
-            without_tags_ids.append(album_id)
+        item_count = get("itemCount")
+        add_id(album_id)
+        add_missing_count(item_count is None or item_count == 0)
+        add_missing_date(not (get("startDate") or get("dateRange")))
+        add_has_tags(bool(get("tags")))
+    
+    # Derive the remaining category masks; each category's ids are only
+    # selected from all_ids when its Alfred item is built
+    incomplete = mask_or(missing_count, missing_date)
+    complete = mask_not(incomplete)
+    missing_both = mask_and(missing_count, missing_date)
+    without_tags = mask_not(has_tags)
+    
+    incomplete_total = incomplete.count(1)
+    complete_total = len(all_ids) - incomplete_total
+    with_tags_total = has_tags.count(1)
+    without_tags_total = len(all_ids) - with_tags_total
+    missing_count_total = missing_count.count(1)
+    missing_date_total = missing_date.count(1)
+    missing_both_total = missing_both.count(1)
     
     # Create Alfred items
     items = []
@@ -143,127 +124,78 @@ def main():
    
     
     # Incomplete albums
-    if incomplete_ids:
-        items.append({
-            "title": f"🔍 Incomplete: {plural(len(incomplete_ids), 'album', 'albums')}",
-            "subtitle": "Albums missing item count or date information",
-            "arg": "",
-            "valid": True,
-            "variables": {
-                "ID_list": ",".join(incomplete_ids),
-                "mySource": "album_stats"
-            },
-            "icon": {"path": "icon.png"}
-        })
+    if incomplete_total:
+        items.append(category_item(
+            "🔍 Incomplete", incomplete_total,
+            "Albums missing item count or date information",
+            write_id_list("incomplete", compress(all_ids, incomplete))
+        ))
     
     # Albums with tags
-    if with_tags_ids:
-        items.append({
-            "title": f"🏷️ With tags: {plural(len(with_tags_ids), 'album', 'albums')}",
-            "subtitle": "Albums that have at least one tag",
-            "arg": "",
-            "valid": True,
-            "variables": {
-                "ID_list": ",".join(with_tags_ids),
-                "mySource": "album_stats"
-            },
-            "icon": {"path": "icon.png"}
-        })
+    if with_tags_total:
+        items.append(category_item(
+            "🏷️ With tags", with_tags_total,
+            "Albums that have at least one tag",
+            write_id_list("with_tags", compress(all_ids, has_tags))
+        ))
     
     # Albums without tags
-    if without_tags_ids:
-        items.append({
-            "title": f"📋 Without tags: {plural(len(without_tags_ids), 'album', 'albums')}",
-            "subtitle": "Albums that have no tags",
-            "arg": "",
-            "valid": True,
-            "variables": {
-                "ID_list": ",".join(without_tags_ids),
-                "mySource": "album_stats"
-            },
-            "icon": {"path": "icon.png"}
-        })
+    if without_tags_total:
+        items.append(category_item(
+            "📋 Without tags", without_tags_total,
+            "Albums that have no tags",
+            write_id_list("without_tags", compress(all_ids, without_tags))
+        ))
     
     # Missing item count
-    if missing_count_ids:
-        items.append({
-            "title": f"📊 Missing item count: {plural(len(missing_count_ids), 'album', 'albums')}",
-            "subtitle": "Albums without item count information",
-            "arg": "",
-            "valid": True,
-            "variables": {
-                "ID_list": ",".join(missing_count_ids),
-                "mySource": "album_stats"
-            },
-            "icon": {"path": "icon.png"}
-        })
+    if missing_count_total:
+        items.append(category_item(
+            "📊 Missing item count", missing_count_total,
+            "Albums without item count information",
+            write_id_list("missing_count", compress(all_ids, missing_count))
+        ))
     
     # Missing date
-    if missing_date_ids:
-        items.append({
-            "title": f"📅 Missing date: {plural(len(missing_date_ids), 'album', 'albums')}",
-            "subtitle": "Albums without date information",
-            "arg": "",
-            "valid": True,
-            "variables": {
-                "ID_list": ",".join(missing_date_ids),
-                "mySource": "album_stats"
-            },
-            "icon": {"path": "icon.png"}
-        })
+    if missing_date_total:
+        items.append(category_item(
+            "📅 Missing date", missing_date_total,
+            "Albums without date information",
+            write_id_list("missing_date", compress(all_ids, missing_date))
+        ))
     
     # Missing both
-    if missing_both_ids:
-        items.append({
-            "title": f"⚠️ Missing both item count and date: {plural(len(missing_both_ids), 'album', 'albums')}",
-            "subtitle": "Albums missing both item count and date",
-            "arg": "",
-            "valid": True,
-            "variables": {
-                "ID_list": ",".join(missing_both_ids),
-                "mySource": "album_stats"
-            },
-            "icon": {"path": "icon.png"}
-        })
+    if missing_both_total:
+        items.append(category_item(
+            "⚠️ Missing both item count and date", missing_both_total,
+            "Albums missing both item count and date",
+            write_id_list("missing_both", compress(all_ids, missing_both))
+        ))
     
 
 
  # Total albums
-    items.append({
-        "title": f"📚 Total: {plural(len(all_ids), 'album', 'albums')}",
-        "subtitle": "Click to view all albums",
-        "arg": "",
-        "valid": True,
-        "variables": {
-            "ID_list": ",".join(all_ids),
-            "mySource": "album_stats"
-        },
-        "icon": {"path": "icon.png"}
-    })
+    items.append(category_item(
+        "📚 Total", len(albums),
+        "Click to view all albums"
+    ))
     
     # Complete albums
-    if complete_ids:
-        items.append({
-            "title": f"✅ Complete: {plural(len(complete_ids), 'album', 'albums')}",
-            "subtitle": "Albums with both item count and date information",
-            "arg": "",
-            "valid": True,
-            "variables": {
-                "ID_list": ",".join(complete_ids),
-                "mySource": "album_stats"
-            },
-            "icon": {"path": "icon.png"}
-        })
+    if complete_total:
+        items.append(category_item(
+            "✅ Complete", complete_total,
+            "Albums with both item count and date information",
+            write_id_list("complete", compress(all_ids, complete))
+        ))
 
     # Summary (non-clickable)
     items.append({
         "title": "📈 Summary",
-        "subtitle": f"{format_number(len(complete_ids))} complete, {format_number(len(incomplete_ids))} incomplete • {format_number(len(with_tags_ids))} tagged, {format_number(len(without_tags_ids))} untagged",
+        "subtitle": f"{format_number(complete_total)} complete, {format_number(incomplete_total)} incomplete • {format_number(with_tags_total)} tagged, {format_number(without_tags_total)} untagged",
         "valid": False,
-        "icon": {"path": "icon.png"}
+        "icon": ICON
     })
 
-    print(alfred_response(items))
+    write_alfred_response(items)
 
 if __name__ == "__main__":
     main()
@@ -4,156 +4,129 @@ Script to list all tags with album counts.
 Returns Alfred JSON format with all tags.
 """
 
-import json
 import sys
-import os
 import re
-from pathlib import Path
 
-def format_number(num):
-    """Format a number with thousand separators."""
-    if num is None:
-        return "0"
-    try:
-        return f"{int(num):,}"
-    except (ValueError, TypeError):
-        return str(num)
+from shared_db import ICON, load_tag_counts, read_database, write_alfred_response
 
-def get_database_path():
-    """Get the path to the photoAlbums.json database."""
-    data_folder = os.getenv('alfred_workflow_data')
-    if not data_folder:
-        # Fallback to script directory if env var not set
-        data_folder = Path(__file__).parent
-    else:
-        data_folder = Path(data_folder)
-    
-    # Create data folder if it doesn't exist
-    if not os.path.exists(data_folder):
-        os.makedirs(data_folder)
-    
-    return data_folder / "photoAlbums.json"
-
-def read_database():
-    """Read all albums from the database."""
-    db_path = get_database_path()
-    albums = []
-    
-    if not db_path.exists():
-        return albums
-    
-    try:
-        with open(db_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    albums.append(json.loads(line))
-    except Exception:
-        return []
-    
-    return albums
-
-def get_all_tags(albums):
-    """Get all unique tags from the database with counts."""
-    tag_counts = {}
-    for album in albums:
-        for tag in album.get('tags', []):
-            if tag in tag_counts:
-                tag_counts[tag] += 1
-            else:
-                tag_counts[tag] = 1
+def get_all_tags():
+    """
+    Get all unique tags from the database with counts, as (tag, normalized_tag, count)
+    tuples so the search filter does not normalize each tag again.
+    The counts come from the tag counts cache shared with tag_menu.py.
+    """
+    tag_counts = load_tag_counts()
     
     # Sort by count (descending), then alphabetically
-    sorted_tags = sorted(tag_counts.items(), key=lambda x: (-x[1], x[0].lower()))
+    sorted_tags = sorted(
+        ((tag, normalize_text(tag), count) for tag, count in tag_counts.items()),
+        key=lambda x: (-x[2], x[0].lower())
+    )
     return sorted_tags
 
+def database_is_empty():
+    """Check whether the database holds any album, parsing no further than the first one."""
+    try:
+        return next(read_database(), None) is None
+    except (OSError, ValueError):
+        return True
+
 def normalize_text(text):
     """Normalize text for searching: lowercase."""
     if not text:
         return ""
     return text.lower().strip()
 
-def alfred_response(items, variables=None):
-    """Create an Alfred JSON response with multiple items and optional variables."""
-    response = {"items": items}
-    if variables:
-        response["variables"] = variables
-    return json.dumps(response, ensure_ascii=False)
+def tag_matcher(normalized_query):
+    """
+    Return a function telling whether a normalized tag matches the query.
+    A single word matches as a plain substring; several words must all appear
+    in the tag in order, so "time trav" finds "time_travel".
+    """
+    words = normalized_query.split()
+    if len(words) < 2:
+        return lambda text: normalized_query in text
+    
+    # [^\x1f] keeps a match from spanning tags joined with \x1f
+    return re.compile("[^\x1f]*".join(map(re.escape, words))).search
+
+def tag_items(matching_tags):
+    """Yield an Alfred item for each matching (tag, count) pair, with position counters."""
+    total_count = len(matching_tags)
+    
+    for idx, (tag, count) in enumerate(matching_tags, 1):
+        album_word = "album" if count == 1 else "albums"
+        subtitle = f"{idx:,}/{total_count:,} Show {count:,} {album_word} with this tag"
+        
+        yield {
+            "title": f"{tag} ({count})",
+            "subtitle": subtitle,
+            "arg": tag,
+            "valid": True,
+            "variables": {
+                "searchTag": tag,
+                "mySource": "tagList"
+            },
+            "icon": ICON
+        }
 
 def main():
     # Get search query from arguments (empty string if none provided)
     search_query = sys.argv[1].strip() if len(sys.argv) > 1 else ""
     
-    # Read database
-    albums = read_database()
+    # Get all tags
+    all_tags = get_all_tags()
     
-    if not albums:
-        print(alfred_response(
+    # Only without tags is the database read, to tell an empty one apart
+    if not all_tags and database_is_empty():
+        write_alfred_response(
             items=[{
                 "title": "No albums found",
                 "subtitle": "The database is empty. Add some albums first!",
                 "valid": False
             }],
             variables={"userInputString": search_query}
-        ))
+        )
         return
     
-    # Get all tags
-    all_tags = get_all_tags(albums)
-    
     if not all_tags:
-        print(alfred_response(
+        write_alfred_response(
             items=[{
                 "title": "No tags found",
                 "subtitle": "Add some tags to your albums first!",
                 "valid": False
             }],
             variables={"userInputString": search_query}
-        ))
+        )
         return
     
     # Filter tags based on search query
     normalized_query = normalize_text(search_query)
-    matching_tags = []
-    
-    for tag, count in all_tags:
-        # Filter by search query if provided
-        if search_query and normalized_query not in normalize_text(tag):
-            continue
-        
-        matching_tags.append((tag, count))
-    
-    # Create Alfred items with position counters
-    total_count = len(matching_tags)
-    matching_items = []
-    
-    for idx, (tag, count) in enumerate(matching_tags, 1):
-        subtitle = f"{format_number(idx)}/{format_number(total_count)} Show {format_number(count)} album{'s' if count != 1 else ''} with this tag"
-        
-        matching_items.append({
-            "title": f"{tag} ({count})",
-            "subtitle": subtitle,
-            "arg": tag,
-            "valid": True,
-            "variables": {
-                "searchTag": tag,
-                "mySource": "tagList"
-            },
-            "icon": {
-                "path": "icon.png" if Path(__file__).parent.joinpath("icon.png").exists() else ""
-            }
-        })
+    matches = tag_matcher(normalized_query)
+    
+    if not search_query:
+        matching_tags = [(tag, count) for tag, _, count in all_tags]
+    elif not matches("\x1f".join(normalized_tag for _, normalized_tag, _ in all_tags)):
+        # A single search over all tags rules out queries that match nothing,
+        # which Alfred sees often while the user is still typing
+        matching_tags = []
+    else:
+        matching_tags = [(tag, count) for tag, normalized_tag, count in all_tags if matches(normalized_tag)]
     
     # If no matches, show a helpful message
-    if not matching_items:
-        matching_items.append({
-            "title": "No tags match your search",
-            "subtitle": f"No results for: {search_query}",
-            "valid": False
-        })
+    if not matching_tags:
+        write_alfred_response(
+            items=[{
+                "title": "No tags match your search",
+                "subtitle": f"No results for: {search_query}",
+                "valid": False
+            }],
+            variables={"userInputString": search_query}
+        )
+        return
     
-    # Output with environment variable
-    print(alfred_response(matching_items, variables={"userInputString": search_query}))
+    # Output with environment variable, one tag item at a time
+    write_alfred_response(tag_items(matching_tags), variables={"userInputString": search_query})
 
 if __name__ == "__main__":
     main()
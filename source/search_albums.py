@@ -12,7 +12,8 @@ Search Query Filters:
   - Regular text   : Search album titles
 
 Environment Variables:
-  - ID_list: Filter by album IDs (comma-separated) - optional
+  - ID_list: Filter by album IDs (comma-separated), or __ALL__ for no filter - optional
+  - ID_list_path: Filter by album IDs listed in this file (one per line) - optional
   - searchTag: Filter by tag - optional
   - mySource: Source context (e.g., 'tagList') - optional
 
@@ -22,12 +23,47 @@ Examples:
   search_albums.py "family y:2022"       # Family albums from 2022
 """
 
-import json
 import sys
 import os
 import re
-from pathlib import Path
-from datetime import datetime
+from functools import lru_cache, partial
+from itertools import chain, compress
+from operator import and_, ge, itemgetter, le, methodcaller
+
+from shared_db import ALL_ALBUMS, ICON, get_database_key, json_dumps_bytes, read_albums, read_derived, read_id_list, write_alfred_response
+
+# Separators that normalize_text treats as spaces
+SEPARATOR_TABLE = str.maketrans('-_/\\|', '     ')
+
+# Compiled once here rather than looked up in re's pattern cache on every call
+YEAR_FILTER_RE = re.compile(r'y:(\d{4})(?:-(\d{4}))?', re.IGNORECASE)
+ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Passed to read_derived; bump it whenever build_search_index changes what it returns
+SEARCH_INDEX_VERSION = 1
+
+# Start year stored for albums without a date: later than any year a y: filter can
+# name (four digits), so the year filter needs no separate check for missing dates
+UNDATED_YEAR = 10000
+
+# Modifier templates shared by every result; each result copies them and fills in its
+# own arg and variables, so only the per-album values are built in the loop
+TAG_MOD = {"subtitle": "Add/remove tags", "arg": "", "valid": True}
+COUNT_MOD = {"subtitle": "Edit item count", "arg": "", "valid": True}
+TITLE_MOD = {"subtitle": "Edit album title", "arg": "", "valid": True}
+LINK_MOD = {"subtitle": "Copy as markdown link", "arg": "", "valid": True}
+DATE_MOD = {"subtitle": "Edit date (yyyy-mm-dd or yyyy-mm-dd--yyyy-mm-dd)", "arg": "", "valid": True}
+DELETE_MOD = {"subtitle": "⚠️ Delete album from database", "arg": "", "valid": True}
+
+# cmd+opt modifier leading back to where the search was opened from, by mySource;
+# it is the same for every result, so all of them share one dict
+BACK_MODS = {
+    "tagList": {"subtitle": "Go back to tag list", "arg": "", "valid": True},
+    "album_stats": {"subtitle": "Go back to album stats", "arg": "", "valid": True}
+}
+
+# Sort key of albums without a date, so they sort after every dated album
+NO_DATE_SORT_KEY = 1 << 40
 
 def format_number(num):
     """Format a number with thousand separators."""
@@ -38,66 +74,13 @@ def format_number(num):
     except (ValueError, TypeError):
         return str(num)
 
-def get_database_path():
-    """Get the path to the photoAlbums.json database."""
-    data_folder = os.getenv('alfred_workflow_data')
-    if not data_folder:
-        # Fallback to script directory if env var not set
-        data_folder = Path(__file__).parent
-    else:
-        data_folder = Path(data_folder)
-    
-    # Create data folder if it doesn't exist
-    if not os.path.exists(data_folder):
-        os.makedirs(data_folder)
-    
-    return data_folder / "photoAlbums.json"
-
-def read_database():
-    """Read all albums from the database."""
-    db_path = get_database_path()
-    albums = []
-    
-    if not db_path.exists():
-        return albums
-    
-    try:
-        with open(db_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    albums.append(json.loads(line))
-    except Exception as e:
-        return []
-    
-    return albums
-
+@lru_cache(maxsize=4096)
 def normalize_text(text):
     """Normalize text for searching: lowercase and replace separators with spaces."""
     if not text:
         return ""
-    # Replace common separators with spaces
-    text = re.sub(r'[-_/\\|]', ' ', text)
-    # Replace multiple spaces with single space
-    text = re.sub(r'\s+', ' ', text)
-    return text.lower().strip()
-
-def matches_search(title, search_terms):
-    """
-    Check if all search terms are found in the title.
-    Search is case-insensitive and treats separators as spaces.
-    """
-    if not search_terms:
-        return True
-    
-    normalized_title = normalize_text(title)
-    
-    # Check if all search terms are present in the title
-    for term in search_terms:
-        if term not in normalized_title:
-            return False
-    
-    return True
+    # Replace common separators with spaces, then collapse runs of whitespace
+    return ' '.join(text.translate(SEPARATOR_TABLE).lower().split())
 
 def clean_title(title):
     """Clean up the title by removing ' - Google Photos' suffix."""
@@ -105,6 +88,7 @@ def clean_title(title):
         return title[:-16]
     return title
 
+@lru_cache(maxsize=8192)
 def parse_date_for_sorting(date_string):
     """
     Parse a date string for sorting.
@@ -116,13 +100,21 @@ def parse_date_for_sorting(date_string):
         return (0, 0, 0)
     
     try:
-        # Try new format first: "2024-10-30"
+        # Fast path for the common "2024-10-30" shape: slice out the fields directly
+        if (len(date_string) == 10 and date_string[4] == '-' and date_string[7] == '-'
+                and date_string[:4].isdigit() and date_string[5:7].isdigit() and date_string[8:].isdigit()):
+            return (int(date_string[:4]), int(date_string[5:7]), int(date_string[8:]))
+        
+        # Try other new format dates, e.g. "2024-1-5"
         if '-' in date_string and len(date_string) >= 8:
             parts = date_string.split('-')
             if len(parts) == 3 and all(p.isdigit() for p in parts):
                 year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
                 return (year, month, day)
         
+        # Only old format dates need datetime, so it is imported here rather than at startup
+        from datetime import datetime
+        
         # Try old format with year: "Oct 30, 2024"
         if ',' in date_string:
             dt = datetime.strptime(date_string.strip(), "%b %d, %Y")
@@ -137,6 +129,19 @@ def parse_date_for_sorting(date_string):
         # If parsing fails, treat as no date
         return (0, 0, 0)
 
+def date_sort_key(sort_date):
+    """
+    Pack a (year, month, day) tuple from parse_date_for_sorting into a single integer
+    that sorts by date descending (most recent first), with no date albums last.
+    Comparing one int per album is cheaper than comparing 4-tuples.
+    """
+    if sort_date == (0, 0, 0):
+        # Larger than any dated key, which are all negative
+        return NO_DATE_SORT_KEY
+    year, month, day = sort_date
+    return -(year * 10000 + month * 100 + day)
+
+@lru_cache(maxsize=8192)
 def extract_year_from_date(date_string):
     """
     Extract year from a date string.
@@ -148,14 +153,13 @@ def extract_year_from_date(date_string):
     
     try:
         # Try new format first: "2024-10-30"
-        if '-' in date_string and len(date_string) >= 4:
-            # Format: yyyy-mm-dd
-            year_str = date_string.split('-')[0]
-            if year_str.isdigit() and len(year_str) == 4:
-                return int(year_str)
+        # Format: yyyy-mm-dd; the year is sliced out without splitting the string
+        if date_string[4:5] == '-' and date_string[:4].isdigit():
+            return int(date_string[:4])
         
         # Try old format: "Oct 30, 2024"
         if ',' in date_string:
+            from datetime import datetime
             dt = datetime.strptime(date_string.strip(), "%b %d, %Y")
             return dt.year
     except:
@@ -177,11 +181,13 @@ def convert_date_to_edit_format(start_date, end_date):
             return None
         
         # Already in yyyy-mm-dd format
-        if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
+        if ISO_DATE_RE.match(date_str):
             return date_str
         
         # Try to parse old format: "Nov 27, 2014" or "Nov 27"
         try:
+            from datetime import datetime
+            
             if ',' in date_str:
                 dt = datetime.strptime(date_str.strip(), "%b %d, %Y")
                 return dt.strftime("%Y-%m-%d")
@@ -225,7 +231,7 @@ def parse_search_filters(search_query):
     
     for term in terms:
         # Check for year filter: y:2024 or y:2023-2024
-        year_match = re.match(r'y:(\d{4})(?:-(\d{4}))?', term, re.IGNORECASE)
+        year_match = YEAR_FILTER_RE.match(term)
         if year_match:
             start_year = int(year_match.group(1))
             end_year = int(year_match.group(2)) if year_match.group(2) else start_year
@@ -247,10 +253,72 @@ def parse_search_filters(search_query):
     
     return year_filter, date_filter, remaining_query
 
-def matches_year_filter(album, year_filter):
+def narrow_search_terms(search_terms):
+    """
+    Order search terms for filtering: longest first, since a longer term usually matches
+    fewer titles and leaves less for the remaining terms to scan. Repeated terms, and
+    terms contained in a longer one (which every title matching that one also contains),
+    are dropped.
+    """
+    narrowed = []
+    for term in sorted(set(search_terms), key=len, reverse=True):
+        if not any(term in longer for longer in narrowed):
+            narrowed.append(term)
+    return narrowed
+
+def build_search_index(albums):
+    """
+    Compute the per-album values that filtering and sorting need but that only change
+    with the database, stored column by column so each filter can scan a single list.
+    Tags and album IDs are stored inverted, as the rows carrying each tag or ID,
+    so the tag and ID filters start from just those albums.
+    Cached by read_derived, so a keystroke only pays for the filters themselves.
+    The albums themselves are not stored: rows index into read_albums()'s list.
     """
-    Check if album matches year filter.
-    year_filter is a tuple (search_start_year, search_end_year)
+    index = {
+        "tag_rows": {},
+        "id_rows": {},
+        "titles": [],
+        "start_years": [],
+        "end_years": [],
+        "sort_keys": []
+    }
+    
+    for row, album in enumerate(albums):
+        for tag in album.get("tags") or ():
+            tag_rows = index["tag_rows"].setdefault(tag, [])
+            # An album listing a tag twice is still a single match
+            if not tag_rows or tag_rows[-1] != row:
+                tag_rows.append(row)
+        
+        start_year = extract_year_from_date(album.get("startDate", ""))
+        if start_year is None:
+            start_year = UNDATED_YEAR
+        end_year = start_year
+        if album.get("endDate") and start_year != UNDATED_YEAR:
+            end_year = extract_year_from_date(album["endDate"])
+            if end_year is None:
+                end_year = start_year
+        
+        index["id_rows"].setdefault(album.get("id", ""), []).append(row)
+        index["titles"].append(normalize_text(album.get("title", "Untitled")))
+        index["start_years"].append(start_year)
+        index["end_years"].append(end_year)
+        index["sort_keys"].append(date_sort_key(parse_date_for_sorting(album.get("startDate", ""))))
+    
+    return index
+
+def select_rows(rows, column, predicate):
+    """
+    Keep the row numbers in rows whose value in column satisfies predicate.
+    map and compress run the loop in C, so as long as predicate is a builtin
+    (a bound method, operator function or partial of one) no Python code runs per album.
+    """
+    return list(compress(rows, map(predicate, map(column.__getitem__, rows))))
+
+def select_year_range(rows, index, year_filter):
+    """
+    Keep the rows whose albums match year_filter, a tuple (search_start_year, search_end_year).
     
     An album matches if:
     1. It's a single-date album and its year falls within the search range, OR
@@ -260,39 +328,17 @@ def matches_year_filter(album, year_filter):
     - Album: 2020-2025, Search: y:2023 -> MATCH (2023 is within album range)
     - Album: 2020-2025, Search: y:2023-2024 -> MATCH (ranges overlap)
     - Album: 2024, Search: y:2020-2025 -> MATCH (2024 is within search range)
-    """
-    if not year_filter:
-        return True
     
+    A single-date album's end year is its start year, so both cases come down to
+    album_start <= search_end AND album_end >= search_start. Albums without a date have
+    UNDATED_YEAR as their start year, which fails the first test, so they never match.
+    Both tests are combined with and_ into a single C-level pass over the rows.
+    """
     search_start_year, search_end_year = year_filter
     
-    start_date = album.get("startDate", "")
-    end_date = album.get("endDate", "")
-    
-    album_start_year = extract_year_from_date(start_date)
-    
-    if album_start_year is None:
-        return False
-    
-    # Check if album has a date range
-    if end_date:
-        album_end_year = extract_year_from_date(end_date)
-        if album_end_year is None:
-            album_end_year = album_start_year
-        
-        # Check if ranges overlap
-        # Ranges overlap if: album_start <= search_end AND album_end >= search_start
-        return album_start_year <= search_end_year and album_end_year >= search_start_year
-    else:
-        # Single date - check if it falls within search range
-        return search_start_year <= album_start_year <= search_end_year
-
-def alfred_response(items, variables=None):
-    """Create an Alfred JSON response with multiple items and optional variables."""
-    response = {"items": items}
-    if variables:
-        response["variables"] = variables
-    return json.dumps(response, ensure_ascii=False)
+    starts_in_range = map(partial(ge, search_end_year), map(index["start_years"].__getitem__, rows))
+    ends_in_range = map(partial(le, search_start_year), map(index["end_years"].__getitem__, rows))
+    return list(compress(rows, map(and_, starts_in_range, ends_in_range)))
 
 def main():
     # Get search query from argv (like original workflow)
@@ -307,174 +353,144 @@ def main():
     
     # Check if we're filtering by album IDs (comma-separated) - from env var only
     filter_ids = os.environ.get("ID_list", "").strip()
+    filter_ids_path = os.environ.get("ID_list_path", "").strip()
     id_set = None
-    if filter_ids:
+    if filter_ids == ALL_ALBUMS:
+        # Sent by list_album_stats.py's Total item: show every album
+        pass
+    elif filter_ids:
         id_set = set(id.strip() for id in filter_ids.split(',') if id.strip())
+    elif filter_ids_path:
+        id_set = read_id_list(filter_ids_path)
+        if id_set is None:
+            # The list file is gone or unreadable: show an empty filtered set, not the whole library
+            id_set = set()
     
     # Normalize and split search query into terms (using remaining query after filter extraction)
     search_terms = normalize_text(remaining_query).split() if remaining_query else []
+    search_terms = narrow_search_terms(search_terms)
     
-    # Read database
-    albums = read_database()
+    # Read the albums and their search index under one database key, so their rows line up
+    key = get_database_key()
+    albums = read_albums(key) if key else []
     
     if not albums:
-        print(alfred_response(
+        write_alfred_response(
             items=[{
                 "title": "No albums found",
                 "subtitle": "The database is empty. Add some albums first!",
                 "valid": False
             }],
             variables={"userInputString": search_query}
-        ))
+        )
         return
     
-    # Filter albums based on search terms and optional tag/ID filters
+    index = read_derived("search", build_search_index, SEARCH_INDEX_VERSION, key)
+    
+    # Filter albums based on search terms and optional tag/ID filters, one column at a time
+    # Start from only the albums in the ID set or with the tag, if either filter is set;
+    # an ID list is typically a handful of albums, so it is looked up rather than scanned
+    if id_set is not None:
+        id_rows = index["id_rows"]
+        rows = sorted(chain.from_iterable(id_rows[album_id] for album_id in id_set if album_id in id_rows))
+        if tag_filter:
+            rows = list(filter(set(index["tag_rows"].get(tag_filter, ())).__contains__, rows))
+    elif tag_filter:
+        rows = index["tag_rows"].get(tag_filter, [])
+    else:
+        rows = range(len(albums))
+    
+    # Keep only albums matching the year filter, if set
+    if year_filter:
+        rows = select_year_range(rows, index, year_filter)
+    
+    # Keep only albums whose title contains every search term
+    # Search is case-insensitive and treats separators as spaces
+    for term in search_terms:
+        rows = select_rows(rows, index["titles"], methodcaller("__contains__", term))
+    
     matching_albums = []
-    for album in albums:
+    for row in rows:
+        album = albums[row]
         title = album.get("title", "Untitled")
         url = album.get("url", "")
         tags = album.get("tags", [])
         item_count = album.get("itemCount")
-        album_id = album.get("id", "")
+        clean = clean_title(title)
         
-        # Skip if ID filter is set and album's ID is not in the set
-        if id_set and album_id not in id_set:
-            continue
+        # Add item count to title if available
+        if item_count is not None and item_count > 0:
+            display_title = f"{clean} ({format_number(item_count)})"
+        else:
+            display_title = clean
         
-        # Skip if tag filter is set and album doesn't have that tag
-        if tag_filter and tag_filter not in tags:
-            continue
+        # Get date information
+        date_range_display = album.get("dateRange", "")
+        start_date = album.get("startDate", "")
+        end_date = album.get("endDate", "")
         
-        # Skip if year filter is set and album doesn't match
-        if not matches_year_filter(album, year_filter):
-            continue
+        # Convert to edit format (yyyy-mm-dd or yyyy-mm-dd--yyyy-mm-dd)
+        date_range_edit = convert_date_to_edit_format(start_date, end_date)
         
-        if matches_search(title, search_terms):
-            clean = clean_title(title)
-            
-            # Add item count to title if available
-            if item_count is not None and item_count > 0:
-                display_title = f"{clean} ({format_number(item_count)})"
-            else:
-                display_title = clean
-            
-            # Get date information
-            date_range_display = album.get("dateRange", "")
-            start_date = album.get("startDate", "")
-            end_date = album.get("endDate", "")
-            
-            # Convert to edit format (yyyy-mm-dd or yyyy-mm-dd--yyyy-mm-dd)
-            date_range_edit = convert_date_to_edit_format(start_date, end_date)
-            
-            # Create subtitle: show date and tags if available, otherwise URL
-            subtitle_parts = []
-            if date_range_display:
-                subtitle_parts.append(f"📅 {date_range_display}")
-            if tags:
-                subtitle_parts.append(f"🏷️ {', '.join(tags)}")
-            
-            if subtitle_parts:
-                subtitle_string = " • ".join(subtitle_parts)
-            else:
-                subtitle_string = url
-            
-            matching_albums.append({
-                "title": display_title,
-                "clean_title": clean,
-                "url": url,
-                "tags": tags,
-                "subtitle_string": subtitle_string,
-                "item_count": item_count,
-                "date_range_edit": date_range_edit,
-                "start_date": start_date,
-                "end_date": end_date,
-                "sort_date": parse_date_for_sorting(start_date)
-            })
+        # Create subtitle: show date and tags if available, otherwise URL
+        subtitle_parts = []
+        if date_range_display:
+            subtitle_parts.append(f"📅 {date_range_display}")
+        if tags:
+            subtitle_parts.append(f"🏷️ {', '.join(tags)}")
+        
+        if subtitle_parts:
+            subtitle_string = " • ".join(subtitle_parts)
+        else:
+            subtitle_string = url
+        
+        matching_albums.append({
+            "title": display_title,
+            "clean_title": clean,
+            "url": url,
+            "tags": tags,
+            "subtitle_string": subtitle_string,
+            "item_count": item_count,
+            "date_range_edit": date_range_edit,
+            "start_date": start_date,
+            "end_date": end_date,
+            "sort_key": index["sort_keys"][row]
+        })
     
     # Sort albums: by date descending (most recent first), then no date albums last
-    matching_albums.sort(key=lambda x: (
-        1 if x['sort_date'] == (0, 0, 0) else 0,  # No date albums last
-        -x['sort_date'][0],  # Year descending (most recent first)
-        -x['sort_date'][1],  # Month descending
-        -x['sort_date'][2]   # Day descending
-    ))
+    matching_albums.sort(key=itemgetter('sort_key'))
     
     # Create Alfred items with position counters
     total_count = len(matching_albums)
+    back_mod = BACK_MODS.get(my_source)
     matching_items = []
     for idx, album_data in enumerate(matching_albums, 1):
         subtitle = f"{format_number(idx)}/{format_number(total_count)} • {album_data['subtitle_string']}"
         
-        # Create full album JSON for editing
-        album_json = json.dumps({
+        # Create full album JSON for editing, encoded once and shared by every mod that
+        # needs it: tag_menu.py reads the url, title and tags from it and ignores itemCount
+        album_json = json_dumps_bytes({
             "url": album_data["url"],
-            "title": album_data.get("clean_title", album_data["title"]),
+            "title": album_data["clean_title"],
             "tags": album_data["tags"],
-            "itemCount": album_data.get("item_count")
-        })
+            "itemCount": album_data["item_count"]
+        }).decode()
         
-        # Build mods dictionary
+        # Build mods dictionary from the shared templates, filling in this album's values
+        clean = album_data["clean_title"]
+        edit_variables = {"albumToEdit": album_json, "albumTitle": clean}
         mods = {
-            "ctrl": {
-                "subtitle": "Add/remove tags",
-                "arg": json.dumps({"url": album_data["url"], "title": album_data.get("clean_title", album_data["title"]), "tags": album_data["tags"]}),
-                "valid": True
-            },
-            "alt": {
-                "subtitle": "Edit item count",
-                "arg": str(album_data.get("item_count", 0)),
-                "valid": True,
-                "variables": {
-                    "albumToEdit": album_json,
-                    "albumTitle": album_data.get("clean_title", album_data["title"])
-                }
-            },
-            "cmd": {
-                "subtitle": "Edit album title",
-                "arg": album_data.get("clean_title", album_data["title"]),
-                "valid": True,
-                "variables": {
-                    "albumToEdit": album_json
-                }
-            },
-            "shift+cmd": {
-                "subtitle": "Copy as markdown link",
-                "arg": f"[Photos: {album_data.get('clean_title', album_data['title'])}]({album_data['url']})",
-                "valid": True
-            },
-            "cmd+ctrl": {
-                "subtitle": "Edit date (yyyy-mm-dd or yyyy-mm-dd--yyyy-mm-dd)",
-                "arg": album_data.get("date_range_edit", ""),
-                "valid": True,
-                "variables": {
-                    "albumToEdit": album_json,
-                    "albumTitle": album_data.get("clean_title", album_data["title"])
-                }
-            },
-            "cmd+alt+ctrl": {
-                "subtitle": "⚠️ Delete album from database",
-                "arg": album_data.get("clean_title", album_data["title"]),
-                "valid": True,
-                "variables": {
-                    "albumToDelete": album_json,
-                    "albumTitle": album_data.get("clean_title", album_data["title"])
-                }
-            }
+            "ctrl": {**TAG_MOD, "arg": album_json},
+            "alt": {**COUNT_MOD, "arg": str(album_data["item_count"]), "variables": edit_variables},
+            "cmd": {**TITLE_MOD, "arg": clean, "variables": {"albumToEdit": album_json}},
+            "shift+cmd": {**LINK_MOD, "arg": f"[Photos: {clean}]({album_data['url']})"},
+            "cmd+ctrl": {**DATE_MOD, "arg": album_data["date_range_edit"], "variables": edit_variables},
+            "cmd+alt+ctrl": {**DELETE_MOD, "arg": clean, "variables": {"albumToDelete": album_json, "albumTitle": clean}}
         }
         
         # Add cmd+opt modifier if coming from tag list or album stats
-        if my_source == "tagList":
-            mods["cmd+alt"] = {
-                "subtitle": "Go back to tag list",
-                "arg": "",
-                "valid": True
-            }
-        elif my_source == "album_stats":
-            mods["cmd+alt"] = {
-                "subtitle": "Go back to album stats",
-                "arg": "",
-                "valid": True
-            }
+        if back_mod:
+            mods["cmd+alt"] = back_mod
         
         matching_items.append({
             "title": album_data["title"],
@@ -482,14 +498,12 @@ def main():
             "arg": album_data["url"],
             "valid": True,
             "mods": mods,
-            "icon": {
-                "path": "icon.png" if Path(__file__).parent.joinpath("icon.png").exists() else ""
-            }
+            "icon": ICON
         })
     
     # If no matches, show a helpful message
     if not matching_items:
-        if id_set:
+        if id_set is not None:
             if search_query:
                 subtitle = f"No albums in the filtered set matching: {search_query}"
             else:
@@ -508,16 +522,18 @@ def main():
             "valid": False
         })
     
-    # Output with environment variables (preserve searchTag, ID_list, and mySource if they were set)
+    # Output with environment variables (preserve searchTag, ID_list, ID_list_path, and mySource if they were set)
     variables = {"userInputString": search_query}
     if tag_filter:
         variables["searchTag"] = tag_filter
     if filter_ids:
         variables["ID_list"] = filter_ids
+    if filter_ids_path:
+        variables["ID_list_path"] = filter_ids_path
     if my_source:
         variables["mySource"] = my_source
     
-    print(alfred_response(matching_items, variables=variables))
+    write_alfred_response(matching_items, variables=variables)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,515 @@
+"""
+Shared access to the photoAlbums.json database.
+
+The database holds one album JSON object per line. Single-album edits patch
+the album's line in place (padding it with spaces) or blank it out on delete,
+and the file is compacted once that leftover space grows too large.
+"""
+
+import io
+import json
+import sys
+import os
+import mmap
+from collections import Counter
+from functools import lru_cache
+
+try:
+    from orjson import loads as json_loads, dumps as json_dumps_bytes
+except ImportError:
+    # orjson is optional: fall back to the standard library
+    json_loads = json.loads
+    
+    def json_dumps_bytes(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+# Rewrite the whole database once padding and tombstoned lines left by
+# in-place edits make up more than this fraction of the file
+COMPACTION_THRESHOLD = 0.25
+
+# read_database memory-maps databases larger than this instead of reading them through a file buffer
+MMAP_THRESHOLD = 64 * 1024
+
+# Values already loaded or built by this process, as {cache_path: (key, value)}, so a
+# script that asks for the same cache twice (read_derived falling back to read_albums,
+# or a long-lived caller importing this module) skips even the unpickling
+LOADED_CACHES = {}
+
+# Passed to load_derived for the tag counts cache; bump it if count_tags changes what it returns
+TAG_COUNTS_VERSION = 1
+
+# Icon for every Alfred item, checked once at import; Alfred only reads it, so items share the dict
+ICON = {"path": "icon.png" if os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.png")) else ""}
+
+# ID_list value that tells search_albums.py to show every album unfiltered
+ALL_ALBUMS = "__ALL__"
+
+# Alfred notification output, filled in with the JSON-encoded title and subtitle
+NOTIFICATION_TEMPLATE = '{"alfredworkflow": {"variables": {"notification_title": %s, "notification_subtitle": %s}}}\n'
+
+def emit(title, subtitle):
+    """Print an Alfred notification with the given title and subtitle."""
+    sys.stdout.write(NOTIFICATION_TEMPLATE % (json.dumps(title), json.dumps(subtitle)))
+
+def fail(title, subtitle):
+    """Print an Alfred error notification and exit with status 1."""
+    emit(title, subtitle)
+    sys.exit(1)
+
+def write_alfred_response(items, variables=None):
+    """
+    Write an Alfred JSON response with items and optional variables to stdout,
+    serializing one item at a time so the whole response is never held in memory.
+    items may be any iterable, including a generator.
+    """
+    write = sys.stdout.buffer.write
+    separator = b''
+    
+    write(b'{"items":[')
+    for item in items:
+        write(separator)
+        write(json_dumps_bytes(item))
+        separator = b','
+    write(b']')
+    
+    if variables:
+        write(b',"variables":')
+        write(json_dumps_bytes(variables))
+    write(b'}')
+
+@lru_cache(maxsize=1)
+def get_database_path():
+    """Get the path to the photoAlbums.json database."""
+    # Plain os.path strings: importing pathlib costs more than these scripts spend on path handling
+    data_folder = os.getenv('alfred_workflow_data')
+    if not data_folder:
+        # Fallback to script directory if env var not set
+        data_folder = os.path.dirname(os.path.abspath(__file__))
+    
+    return os.path.join(data_folder, "photoAlbums.json")
+
+def ensure_data_folder():
+    """
+    Create the data folder if it doesn't exist and return its path.
+    Only paths that write call this, so read-only runs skip the check.
+    """
+    data_folder = os.path.dirname(get_database_path())
+    os.makedirs(data_folder, exist_ok=True)
+    return data_folder
+
+def write_id_list(name, ids):
+    """
+    Write album ids, one per line, to ids_<name>.txt next to the database and return its path.
+    Passing the path between Alfred steps keeps large id lists out of workflow variables.
+    """
+    path = os.path.join(ensure_data_folder(), f"ids_{name}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(ids))
+    return path
+
+def read_id_list(path):
+    """
+    Read the set of album ids written by write_id_list. Returns None if the file is
+    missing or cannot be read, so callers can tell that apart from an empty list.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return set(f.read().split())
+    except OSError:
+        return None
+
+def read_database():
+    """
+    Yield the albums in the database one at a time, skipping padding and tombstoned lines,
+    so callers that only need the first match can stop early.
+    Raises OSError or ValueError if the database cannot be read.
+    """
+    db_path = get_database_path()
+    
+    if not os.path.exists(db_path):
+        return
+    
+    with open(db_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= MMAP_THRESHOLD:
+            for line in f.read().splitlines():
+                if line and not line.isspace():
+                    yield json_loads(line)
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            end = len(mm)
+            while start < end:
+                newline = mm.find(b'\n', start)
+                if newline == -1:
+                    newline = end
+                line = mm[start:newline]
+                if line and not line.isspace():
+                    yield json_loads(line)
+                start = newline + 1
+
+def get_cache_path(name=None):
+    """
+    Get the path to a pickle cache kept next to the database: photoAlbums.pkl for the
+    parsed albums, or photoAlbums.<name>.pkl for data derived from them.
+    """
+    stem = os.path.splitext(get_database_path())[0]
+    return f"{stem}.{name}.pkl" if name else f"{stem}.pkl"
+
+def get_database_key():
+    """Return the (mtime, size) pair that caches are keyed on, or None if the database is missing."""
+    try:
+        stat = os.stat(get_database_path())
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def read_cache(cache_path, key):
+    """Return the value pickled at cache_path if it was stored under key, otherwise None."""
+    loaded = LOADED_CACHES.get(cache_path)
+    if loaded is not None and loaded[0] == key:
+        return loaded[1]
+    
+    # Imported here so the edit scripts, which never load the whole database, skip it
+    import pickle
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, value = pickle.load(f)
+        if cached_key == key:
+            LOADED_CACHES[cache_path] = (key, value)
+            return value
+    except Exception:
+        pass
+    return None
+
+def write_cache(cache_path, key, value):
+    """Pickle value together with key to cache_path, ignoring failures."""
+    import pickle
+    
+    LOADED_CACHES[cache_path] = (key, value)
+    
+    # Write through a per-process temporary file so concurrent runs never see a partial cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_albums(strict=False):
+    """
+    Read all albums from the database, or return an empty list if it cannot be read.
+    The parsed albums are pickled next to the database together with its mtime and size,
+    and loaded from there for as long as the database is unchanged.
+    The albums are shared with LOADED_CACHES, so callers must copy any album they modify.
+    With strict=True a database that exists but cannot be read raises OSError or
+    ValueError instead, for callers that go on to rewrite the whole database.
+    """
+    key = get_database_key()
+    if key is None:
+        return []
+    return read_albums(key, strict)
+
+def read_albums(key, strict=False):
+    """Return the albums for the database as of key, as load_albums does."""
+    cache_path = get_cache_path()
+    albums = read_cache(cache_path, key)
+    if albums is not None:
+        return albums
+    
+    try:
+        albums = parse_range(get_database_path(), 0, key[1])
+    except (OSError, ValueError):
+        if strict:
+            raise
+        return []
+    
+    write_cache(cache_path, key, albums)
+    return albums
+
+def load_derived(name, build, version=1):
+    """
+    Return build(albums) for the current database. The result is pickled to
+    photoAlbums.<name>.pkl under the same key as the album cache, so a script can keep
+    per-album values it would otherwise recompute on every run without ever storing
+    them in the database itself.
+    Callers bump version whenever the shape of build's result changes, so caches
+    written by an older version of the script are rebuilt rather than misread.
+    """
+    key = get_database_key()
+    if key is None:
+        return build([])
+    return read_derived(name, build, version, key)
+
+def read_derived(name, build, version, key):
+    """
+    Return build(albums) for the database as of key, as load_derived does. Together with
+    read_albums under the same key, this gives albums and derived values from one snapshot.
+    """
+    cache_path = get_cache_path(name)
+    value = read_cache(cache_path, (version,) + key)
+    if value is not None:
+        return value
+    
+    albums = read_albums(key)
+    value = build(albums)
+    if albums:
+        write_cache(cache_path, (version,) + key, value)
+    return value
+
+def count_tags(albums):
+    """Count how many albums carry each tag."""
+    tag_counts = Counter()
+    for album in albums:
+        tag_counts.update(album.get('tags') or ())
+    return tag_counts
+
+def load_tag_counts():
+    """
+    Return the Counter of albums per tag, cached in photoAlbums.tags.pkl so scripts
+    that only list tags never load the albums themselves.
+    """
+    return load_derived("tags", count_tags, TAG_COUNTS_VERSION)
+
+def read_tag_counts():
+    """
+    Return the cached tag counts if they match the database as it is now, otherwise None.
+    Unlike load_tag_counts this never counts the tags itself, so an edit can cheaply pick
+    up the counts before its write drops the cache, adjust them and store them again
+    with write_tag_counts.
+    """
+    key = get_database_key()
+    if key is None:
+        return None
+    return read_cache(get_cache_path("tags"), (TAG_COUNTS_VERSION,) + key)
+
+def write_tag_counts(tag_counts):
+    """Cache tag_counts as the tag counts of the database as it is now."""
+    key = get_database_key()
+    if key is not None:
+        write_cache(get_cache_path("tags"), (TAG_COUNTS_VERSION,) + key, tag_counts)
+
+def invalidate_cache():
+    """
+    Remove the pickle caches after a write. The mtime and size key already catches most
+    changes, but an in-place edit keeps the size and can land within the filesystem's
+    timestamp granularity, so writers drop the caches rather than rely on the key alone.
+    """
+    LOADED_CACHES.clear()
+    
+    data_folder, db_name = os.path.split(get_database_path())
+    prefix = os.path.splitext(db_name)[0] + "."
+    
+    try:
+        names = os.listdir(data_folder)
+    except OSError:
+        return
+    
+    for name in names:
+        if name.startswith(prefix) and name.endswith(".pkl"):
+            try:
+                os.remove(os.path.join(data_folder, name))
+            except OSError:
+                pass
+
+def parse_range(db_path, start, end):
+    """
+    Parse the albums in bytes start to end of the database, which must begin and end on line
+    boundaries. The range is read in one call, then walked line by line through a BytesIO,
+    which shares the buffer instead of materializing a list of every line as split() would.
+    """
+    with open(db_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    
+    # Each line keeps its newline; the JSON parser skips it like any trailing whitespace
+    return [json_loads(line) for line in io.BytesIO(data) if not line.isspace()]
+
+def find_record(url):
+    """
+    Find the album with the given URL without parsing the rest of the database:
+    the file is memory-mapped and searched for the URL as a JSON string, and only
+    the line containing a hit is parsed.
+    Returns (record, wasted_bytes): record is an (album, offset, length) tuple
+    locating the album's line in the file, or None if the album is not in the
+    database, and wasted_bytes counts the padding and tombstoned lines left
+    behind by in-place edits, apart from the album's own padding, which
+    patch_record and tombstone_record count again after rewriting the line.
+    Raises OSError or ValueError if the database cannot be read.
+    """
+    db_path = get_database_path()
+    
+    if not os.path.exists(db_path) or not os.path.getsize(db_path):
+        return None, 0
+    
+    with open(db_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        record = find_line(mm, url)
+        wasted_bytes = count_wasted_bytes(mm)
+        if record:
+            _, offset, length = record
+            wasted_bytes -= length - 1 - len(mm[offset:offset + length - 1].rstrip())
+        return record, wasted_bytes
+
+def find_line(mm, url):
+    """Return (album, offset, length) for the line of mm holding the album with this URL, or None."""
+    needle = json_dumps_bytes(url)
+    start = 0
+    
+    while True:
+        hit = mm.find(needle, start)
+        if hit == -1:
+            return None
+        
+        line_start = mm.rfind(b'\n', 0, hit) + 1
+        line_end = mm.find(b'\n', hit)
+        if line_end == -1:
+            line_end = len(mm)
+        
+        # The URL may also appear in another field, so check the parsed album
+        album = json_loads(mm[line_start:line_end])
+        if album.get("url") == url:
+            return album, line_start, line_end + 1 - line_start
+        start = line_end
+
+def count_wasted_bytes(mm):
+    """Count the padding and tombstoned lines in mm; both end in a space followed by a newline."""
+    wasted_bytes = 0
+    pos = mm.find(b' \n')
+    
+    while pos != -1:
+        line_start = mm.rfind(b'\n', 0, pos) + 1
+        content = mm[line_start:pos].rstrip()
+        wasted_bytes += pos + 1 - line_start - len(content)
+        if not content:
+            # A tombstone also wastes its newline
+            wasted_bytes += 1
+        pos = mm.find(b' \n', pos + 1)
+    
+    return wasted_bytes
+
+def patch_record(offset, length, album, wasted_bytes):
+    """
+    Overwrite a single album line in place, padded with spaces to its original length,
+    then compact the database if it has grown too sparse.
+    If the updated album no longer fits, rewrite the database with stream_edit instead.
+    """
+    db_path = get_database_path()
+    data = json_dumps_bytes(album)
+    
+    if len(data) >= length:
+        return stream_edit(album["url"], lambda old_album: album)
+    
+    try:
+        with open(db_path, 'r+b') as f:
+            f.seek(offset)
+            f.write(data.ljust(length - 1) + b'\n')
+    except Exception as e:
+        print(f"Error writing database: {e}", file=sys.stderr)
+        return False
+    finally:
+        invalidate_cache()
+    
+    return compact_database(wasted_bytes + length - 1 - len(data))
+
+def tombstone_record(offset, length, wasted_bytes):
+    """
+    Blank out a single album line with spaces so that readers skip it,
+    then compact the database if it has grown too sparse.
+    """
+    db_path = get_database_path()
+    
+    try:
+        with open(db_path, 'r+b') as f:
+            f.seek(offset)
+            f.write(b' ' * (length - 1) + b'\n')
+    except Exception as e:
+        print(f"Error writing database: {e}", file=sys.stderr)
+        return False
+    finally:
+        invalidate_cache()
+    
+    return compact_database(wasted_bytes + length)
+
+def stream_edit(url, patch_fn):
+    """
+    Rewrite the database one line at a time through a temporary file, replacing the
+    album with the given URL by patch_fn(album) and dropping padding and tombstoned
+    lines. The temporary file is fsynced and then atomically replaces the database, so a failure
+    mid-write never leaves a truncated database behind.
+    Only lines containing the URL are parsed; all others are copied verbatim.
+    """
+    db_path = get_database_path()
+    tmp_path = db_path + '.tmp'
+    needle = json_dumps_bytes(url)
+    
+    try:
+        with open(db_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            for line in src:
+                line = line.rstrip()
+                if not line:
+                    continue
+                if needle in line:
+                    album = json_loads(line)
+                    if album.get("url") == url:
+                        line = json_dumps_bytes(patch_fn(album))
+                dst.write(line + b'\n')
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, db_path)
+        invalidate_cache()
+        return True
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"Error writing database: {e}", file=sys.stderr)
+        return False
+
+def compact_database(wasted_bytes):
+    """
+    Rewrite the database without padding and tombstoned lines once they exceed
+    COMPACTION_THRESHOLD of the file. Lines are copied as-is, without parsing.
+    """
+    db_path = get_database_path()
+    
+    try:
+        size = os.path.getsize(db_path)
+    except OSError:
+        return True
+    
+    if not size or wasted_bytes <= size * COMPACTION_THRESHOLD:
+        return True
+    
+    try:
+        with open(db_path, 'rb') as f:
+            lines = [line.rstrip() for line in f]
+    except Exception as e:
+        print(f"Error reading database: {e}", file=sys.stderr)
+        return False
+    
+    return write_database(b''.join(line + b'\n' for line in lines if line))
+
+def write_database(data):
+    """
+    Replace the database with data (bytes) crash-safely: the data is written and
+    fsynced to a temporary file next to the database, which then atomically
+    replaces it, so an interrupted write never leaves a truncated database.
+    """
+    db_path = get_database_path()
+    tmp_path = db_path + '.tmp'
+    
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, db_path)
+        invalidate_cache()
+        return True
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"Error writing database: {e}", file=sys.stderr)
+        return False
@@ -13,30 +13,40 @@ Features:
 import json
 import sys
 import os
-import uuid
 import re
-from pathlib import Path
-from datetime import datetime
+import time
+from functools import lru_cache
 
-def get_database_path():
-    """Get the path to the photoAlbums.json database."""
-    data_folder = os.getenv('alfred_workflow_data')
-    if not data_folder:
-        # Fallback to script directory if env var not set
-        data_folder = Path(__file__).parent
-    else:
-        data_folder = Path(data_folder)
-    
-    # Create data folder if it doesn't exist
-    if not os.path.exists(data_folder):
-        os.makedirs(data_folder)
-    
-    return data_folder / "photoAlbums.json"
+from shared_db import ICON, ensure_data_folder, json_dumps_bytes, load_albums, write_alfred_response, write_database
+
+# Month numbers and lengths, used to parse the scraper's "Nov 27, 2014" dates without strptime
+MONTH_NUMBERS = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+                 "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Dates already in storage format (yyyy-mm-dd)
+ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Report summary sections: title label, subtitle when the section has albums, subtitle when it is empty
+REPORT_SECTIONS = (
+    ("✅ Added", "Click to view newly added albums", "No new albums"),
+    ("🔄 Updated", "Click to view updated albums", "No albums were updated"),
+    ("⚪ Unchanged", "Click to view unchanged albums", "No unchanged albums"),
+)
 
 def generate_unique_id():
-    """Generate a unique ID for an album."""
-    return str(uuid.uuid4())
+    """
+    Generate a unique ID for an album, formatted as a random (version 4) UUID.
+    Built straight from os.urandom, which is what uuid.uuid4 does underneath,
+    without importing the uuid module or creating a UUID object per album.
+    """
+    raw = bytearray(os.urandom(16))
+    raw[6] = raw[6] & 0x0f | 0x40  # version 4
+    raw[8] = raw[8] & 0x3f | 0x80  # RFC 4122 variant
+    hex_id = raw.hex()
+    return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
 
+@lru_cache(maxsize=4096)
 def convert_date_to_storage_format(date_string):
     """
     Convert date from display format to storage format (yyyy-mm-dd).
@@ -46,22 +56,39 @@ def convert_date_to_storage_format(date_string):
     if not date_string:
         return date_string
     
+    # Strip once; every format below works on the stripped string
+    stripped = date_string.strip()
+    
     # Already in yyyy-mm-dd format
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_string.strip()):
-        return date_string.strip()
+    if ISO_DATE_RE.match(stripped):
+        return stripped
+    
+    if ',' in stripped:
+        # Format with year: "Nov 27, 2014"
+        full_date = stripped
+    else:
+        # Format without year: "Nov 27" - use current year
+        full_date = f"{stripped}, {time.localtime().tm_year}"
+    
+    # Fast path: look the month up in a table instead of going through strptime's locale handling
+    month_day, _, year = full_date.partition(", ")
+    month_name, _, day = month_day.partition(" ")
+    month = MONTH_NUMBERS.get(month_name)
+    if month and len(year) == 4 and year[0] != "0" and 1 <= len(day) <= 2 and full_date.isascii() and year.isdigit() and day.isdigit():
+        year, day = int(year), int(day)
+        days = DAYS_IN_MONTH[month - 1]
+        if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+            days = 29
+        if not 1 <= day <= days:
+            return date_string
+        return f"{year}-{month:02d}-{day:02d}"
     
     try:
-        # Try format with year: "Nov 27, 2014"
-        if ',' in date_string:
-            dt = datetime.strptime(date_string.strip(), "%b %d, %Y")
-            return dt.strftime("%Y-%m-%d")
-        else:
-            # Format without year: "Nov 27" - use current year
-            current_year = datetime.now().year
-            # Parse with current year to avoid deprecation warning
-            dt = datetime.strptime(f"{date_string.strip()}, {current_year}", "%b %d, %Y")
-            return dt.strftime("%Y-%m-%d")
-    except:
+        # Anything else (lowercase months, odd spacing) goes through strptime
+        from datetime import datetime
+        dt = datetime.strptime(full_date, "%b %d, %Y")
+        return dt.strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
         # If parsing fails, return original
         return date_string
 
@@ -82,75 +109,73 @@ def normalize_date_range(start_date, end_date):
     
     return start_normalized
 
-def read_existing_albums():
-    """Read all existing albums from the database into a dict keyed by URL."""
-    db_path = get_database_path()
-    albums_dict = {}
-    
-    if not db_path.exists():
-        return albums_dict
+def normalize_item_counts(new_item_count, existing_item_count):
+    """
+    Convert a scraped and a stored itemCount to ints for comparison.
+    Returns both unchanged if either can't be converted.
+    """
+    # Both are usually ints already (or the stored one is missing), so skip the conversions
+    if type(new_item_count) is int and (existing_item_count is None or type(existing_item_count) is int):
+        return new_item_count, existing_item_count
     
     try:
-        with open(db_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    album = json.loads(line)
-                    url = album.get('url', '')
-                    if url:
-                        # Add ID if missing
-                        if 'id' not in album:
-                            album['id'] = generate_unique_id()
-                        albums_dict[url] = album
-    except Exception as e:
-        return {}
+        new_count_int = int(new_item_count) if new_item_count is not None else None
+        existing_count_int = int(existing_item_count) if existing_item_count is not None else None
+    except (ValueError, TypeError):
+        return new_item_count, existing_item_count
     
-    return albums_dict
+    return new_count_int, existing_count_int
 
-def write_albums_database(albums_dict):
-    """Write the entire albums database (overwrites existing file)."""
-    db_path = get_database_path()
+def read_existing_albums():
+    """
+    Read all existing albums from the database into a dict keyed by URL.
+    The albums come from shared_db's load_albums, so an unchanged database is
+    loaded from its pickle cache instead of being parsed line by line again.
+    Returns (albums_dict, id_added), where id_added is True if any album was
+    missing an ID and got a new one, so the caller knows to save it.
+    Raises OSError or ValueError if the database exists but cannot be read, since
+    the caller rewrites it from albums_dict and an empty dict would drop every album.
+    """
+    albums_dict = {}
+    id_added = False
     
-    try:
-        with open(db_path, 'w', encoding='utf-8') as f:
-            for album in albums_dict.values():
-                f.write(json.dumps(album, ensure_ascii=False) + '\n')
-        return True
-    except Exception as e:
-        print(f"Error writing database: {e}", file=sys.stderr)
-        return False
+    for album in load_albums(strict=True):
+        url = album.get('url', '')
+        if url:
+            # load_albums' dicts are shared with its in-process cache
+            album = dict(album)
+            # Add ID if missing or empty, in a single lookup
+            if not album.get('id'):
+                album['id'] = generate_unique_id()
+                id_added = True
+            albums_dict[url] = album
+    
+    return albums_dict, id_added
 
-def alfred_response(items):
-    """Create an Alfred JSON response with items."""
-    return json.dumps({"items": items}, ensure_ascii=False)
+def write_albums_database(albums_dict):
+    """
+    Write the entire albums database (overwrites existing file).
+    The lines are joined into one buffer and handed to shared_db's write_database,
+    which writes it in a single call and atomically replaces the old file.
+    """
+    # write_database puts its temp file in the data folder, so make sure it exists
+    ensure_data_folder()
+    return write_database(b''.join(json_dumps_bytes(album) + b'\n' for album in albums_dict.values()))
 
 def create_alfred_report(unchanged_ids, updated_ids, added_ids, albums_dict):
-    """Create Alfred JSON response with summary and clickable items."""
+    """Create the Alfred response items: a summary with clickable items."""
     items = []
     
-    def format_number(num):
-        """Format a number with thousand separators."""
-        if num is None:
-            return "0"
-        try:
-            return f"{int(num):,}"
-        except (ValueError, TypeError):
-            return str(num)
+    # Check if this is a single album import
+    total_count = len(added_ids) + len(updated_ids) + len(unchanged_ids)
+    is_single = (total_count == 1)
     
-    # Helper function for proper pluralization with formatted numbers
-    def plural(count, singular, plural_form):
-        return f"{format_number(count)} {singular if count == 1 else plural_form}"
+    # Index albums by ID once, and only when a single album import needs the lookup
+    id_index = {album['id']: album for album in albums_dict.values() if 'id' in album} if is_single else {}
     
     # Helper function to get album data by ID
     def get_album_by_id(album_id):
-        for album in albums_dict.values():
-            if album.get('id') == album_id:
-                return album
-        return None
-    
-    # Check if this is a single album import
-    total_count = len(added_ids) + len(updated_ids) + len(unchanged_ids)
-    is_single = (total_count == 1)
+        return id_index.get(album_id)
     
     # Function to add markdown link modifier and title for single album
     def enhance_single_album_item(item, album_ids, base_title):
@@ -172,55 +197,23 @@ def create_alfred_report(unchanged_ids, updated_ids, added_ids, albums_dict):
         return item
     
     # Summary items with variables to pass IDs as environment variable
-    added_item = {
-        "title": f"✅ Added: {plural(len(added_ids), 'album', 'albums')}",
-        "subtitle": "Click to view newly added albums" if added_ids else "No new albums",
-        "arg": "",  # Empty arg - we use variables instead
-        "valid": bool(added_ids),
-        "variables": {
-            "ID_list": ",".join(added_ids) if added_ids else ""
-        },
-        "icon": {"path": "icon.png"}
-    }
-    items.append(enhance_single_album_item(
-        added_item, 
-        added_ids, 
-        f"✅ Added: {plural(len(added_ids), 'album', 'albums')}"
-    ))
-    
-    updated_item = {
-        "title": f"🔄 Updated: {plural(len(updated_ids), 'album', 'albums')}",
-        "subtitle": "Click to view updated albums" if updated_ids else "No albums were updated",
-        "arg": "",  # Empty arg - we use variables instead
-        "valid": bool(updated_ids),
-        "variables": {
-            "ID_list": ",".join(updated_ids) if updated_ids else ""
-        },
-        "icon": {"path": "icon.png"}
-    }
-    items.append(enhance_single_album_item(
-        updated_item, 
-        updated_ids, 
-        f"🔄 Updated: {plural(len(updated_ids), 'album', 'albums')}"
-    ))
-    
-    unchanged_item = {
-        "title": f"⚪ Unchanged: {plural(len(unchanged_ids), 'album', 'albums')}",
-        "subtitle": "Click to view unchanged albums" if unchanged_ids else "No unchanged albums",
-        "arg": "",  # Empty arg - we use variables instead
-        "valid": bool(unchanged_ids),
-        "variables": {
-            "ID_list": ",".join(unchanged_ids) if unchanged_ids else ""
-        },
-        "icon": {"path": "icon.png"}
-    }
-    items.append(enhance_single_album_item(
-        unchanged_item, 
-        unchanged_ids, 
-        f"⚪ Unchanged: {plural(len(unchanged_ids), 'album', 'albums')}"
-    ))
+    for (label, subtitle, empty_subtitle), album_ids in zip(REPORT_SECTIONS, (added_ids, updated_ids, unchanged_ids)):
+        # The count is always an int here, so it is formatted directly with thousand separators
+        count = len(album_ids)
+        title = f"{label}: {count:,} {'album' if count == 1 else 'albums'}"
+        item = {
+            "title": title,
+            "subtitle": subtitle if album_ids else empty_subtitle,
+            "arg": "",  # Empty arg - we use variables instead
+            "valid": bool(album_ids),
+            "variables": {
+                "ID_list": ",".join(album_ids)
+            },
+            "icon": ICON
+        }
+        items.append(enhance_single_album_item(item, album_ids, title))
     
-    return alfred_response(items)
+    return items
 
 def process_single_album(album_data, albums_dict):
     """Process a single album import with date information."""
@@ -240,13 +233,11 @@ def process_single_album(album_data, albums_dict):
     end_date = convert_date_to_storage_format(raw_end_date) if raw_end_date else None
     date_range = normalize_date_range(start_date, end_date) if start_date else None
     
-    if url in albums_dict:
+    existing_album = albums_dict.get(url)
+    if existing_album is not None:
         # Album exists - update it
-        existing_album = albums_dict[url]
-        album_id = existing_album.get('id')
-        if not album_id:
-            album_id = generate_unique_id()
-            existing_album['id'] = album_id
+        # read_existing_albums has already given every album an ID
+        album_id = existing_album['id']
         
         updated = False
         
@@ -255,12 +246,7 @@ def process_single_album(album_data, albums_dict):
         existing_item_count = existing_album.get("itemCount")
         if new_item_count is not None:
             # Convert to int for consistent comparison
-            try:
-                new_count_int = int(new_item_count) if new_item_count is not None else None
-                existing_count_int = int(existing_item_count) if existing_item_count is not None else None
-            except (ValueError, TypeError):
-                new_count_int = new_item_count
-                existing_count_int = existing_item_count
+            new_count_int, existing_count_int = normalize_item_counts(new_item_count, existing_item_count)
             
             # Only update if existing is missing or 0, AND new value is different
             if existing_count_int is None or existing_count_int == 0:
@@ -268,18 +254,18 @@ def process_single_album(album_data, albums_dict):
                     existing_album["itemCount"] = new_count_int
                     updated = True
         
+        # Normalize the existing dates once; all three comparisons below use them
+        existing_start = existing_album.get("startDate")
+        existing_end = existing_album.get("endDate")
+        normalized_existing_start = convert_date_to_storage_format(existing_start) if existing_start else None
+        normalized_existing_end = convert_date_to_storage_format(existing_end) if existing_end else None
+        
         # Update date fields if new data is provided (normalize existing dates for comparison)
         if date_range:
-            # Normalize existing dates for comparison
-            existing_start = existing_album.get("startDate")
-            existing_end = existing_album.get("endDate")
-            
             # Build normalized existing date range for comparison
             normalized_existing_range = None
-            if existing_start:
-                normalized_existing_start = convert_date_to_storage_format(existing_start)
-                if existing_end:
-                    normalized_existing_end = convert_date_to_storage_format(existing_end)
+            if normalized_existing_start:
+                if normalized_existing_end:
                     normalized_existing_range = f"{normalized_existing_start}--{normalized_existing_end}"
                 else:
                     normalized_existing_range = normalized_existing_start
@@ -289,15 +275,11 @@ def process_single_album(album_data, albums_dict):
                 updated = True
         
         if start_date:
-            existing_start_raw = existing_album.get("startDate")
-            normalized_existing_start = convert_date_to_storage_format(existing_start_raw) if existing_start_raw else None
             if normalized_existing_start != start_date:
                 existing_album["startDate"] = start_date
                 updated = True
         
         if end_date:
-            existing_end_raw = existing_album.get("endDate")
-            normalized_existing_end = convert_date_to_storage_format(existing_end_raw) if existing_end_raw else None
             if normalized_existing_end != end_date:
                 existing_album["endDate"] = end_date
                 updated = True
@@ -344,13 +326,11 @@ def process_bulk_albums(albums_data, albums_dict):
         
         new_item_count = album_input.get("itemCount")
         
-        if url in albums_dict:
+        existing_album = albums_dict.get(url)
+        if existing_album is not None:
             # Album exists
-            existing_album = albums_dict[url]
-            album_id = existing_album.get('id')
-            if not album_id:
-                album_id = generate_unique_id()
-                existing_album['id'] = album_id
+            # read_existing_albums has already given every album an ID
+            album_id = existing_album['id']
             
             existing_item_count = existing_album.get("itemCount")
             
@@ -359,12 +339,7 @@ def process_bulk_albums(albums_data, albums_dict):
             should_update = False
             if new_item_count is not None:
                 # Convert to int for consistent comparison
-                try:
-                    new_count_int = int(new_item_count) if new_item_count is not None else None
-                    existing_count_int = int(existing_item_count) if existing_item_count is not None else None
-                except (ValueError, TypeError):
-                    new_count_int = new_item_count
-                    existing_count_int = existing_item_count
+                new_count_int, existing_count_int = normalize_item_counts(new_item_count, existing_item_count)
                 
                 # Only update if existing is missing or 0, AND new value is different
                 if existing_count_int is None or existing_count_int == 0:
@@ -395,11 +370,11 @@ def process_bulk_albums(albums_data, albums_dict):
 
 def main():
     if len(sys.argv) < 2:
-        print(alfred_response([{
+        write_alfred_response([{
             "title": "Error: No data provided",
             "subtitle": "Usage: unified_add_albums.py '<json_data>'",
             "valid": False
-        }]))
+        }])
         sys.exit(1)
     
     try:
@@ -408,15 +383,23 @@ def main():
         
         # Handle error objects from the scraper
         if isinstance(data, dict) and 'error' in data:
-            print(alfred_response([{
+            write_alfred_response([{
                 "title": f"Error: {data['error']}",
                 "subtitle": "Make sure you're on a Google Photos page",
                 "valid": False
-            }]))
+            }])
             sys.exit(1)
         
-        # Read existing albums
-        albums_dict = read_existing_albums()
+        # Read existing albums, stopping before any write if the database can't be read
+        try:
+            albums_dict, id_added = read_existing_albums()
+        except (OSError, ValueError) as e:
+            write_alfred_response([{
+                "title": "Error: Could not read the database",
+                "subtitle": str(e),
+                "valid": False
+            }])
+            sys.exit(1)
         
         # Determine type and process accordingly
         data_type = data.get('type') if isinstance(data, dict) else None
@@ -439,49 +422,50 @@ def main():
             # Bulk import
             albums_data = data.get('albums', [])
             if not albums_data:
-                print(alfred_response([{
+                write_alfred_response([{
                     "title": "No albums to process",
                     "subtitle": "No albums found on this page",
                     "valid": False
-                }]))
+                }])
                 return
             unchanged_ids, updated_ids, added_ids = process_bulk_albums(albums_data, albums_dict)
         
         else:
-            print(alfred_response([{
+            write_alfred_response([{
                 "title": "Error: Invalid data format",
                 "subtitle": "Unexpected data structure from scraper",
                 "valid": False
-            }]))
+            }])
             sys.exit(1)
         
-        # Write the updated database
-        if updated_ids or added_ids:
+        # Write the updated database, also saving any IDs given to albums that lacked one
+        # so they aren't regenerated on every run
+        if updated_ids or added_ids or id_added:
             success = write_albums_database(albums_dict)
             if not success:
-                print(alfred_response([{
+                write_alfred_response([{
                     "title": "ERROR: Failed to write to database!",
                     "subtitle": "Check file permissions",
                     "valid": False
-                }]))
+                }])
                 sys.exit(1)
         
         # Output Alfred JSON report
-        print(create_alfred_report(unchanged_ids, updated_ids, added_ids, albums_dict))
+        write_alfred_response(create_alfred_report(unchanged_ids, updated_ids, added_ids, albums_dict))
     
     except json.JSONDecodeError as e:
-        print(alfred_response([{
+        write_alfred_response([{
             "title": f"Error: Invalid JSON data",
             "subtitle": str(e),
             "valid": False
-        }]))
+        }])
         sys.exit(1)
     except Exception as e:
-        print(alfred_response([{
+        write_alfred_response([{
             "title": f"Error processing albums",
             "subtitle": str(e),
             "valid": False
-        }]))
+        }])
         import traceback
         traceback.print_exc()
         sys.exit(1)